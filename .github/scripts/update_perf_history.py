@@ -1,31 +1,124 @@
 #!/usr/bin/env python3
 import json
 import os
+from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 MATRIX_ARTIFACT_ENV_VAR = "TYPEMILL_MATRIX_ARTIFACT_DIR"
 DEFAULT_ARTIFACT_DIR = "perf-artifacts"
 PERF_HISTORY_SCHEMA_VERSION = 1
 
 ARTIFACT_DIR = Path(os.environ.get(MATRIX_ARTIFACT_ENV_VAR, DEFAULT_ARTIFACT_DIR))
 HISTORY_DIR = Path(".perf-history")
-HISTORY_FILE = HISTORY_DIR / "perf_history.json"
+HISTORY_FILE = HISTORY_DIR / "perf_history.jsonl"
+LEGACY_HISTORY_FILE = HISTORY_DIR / "perf_history.json"
+HISTORY_MAX_RUNS = 30
+# Trim once the file grows past HISTORY_TRIM_BYTES. A trim keeps at most
+# HISTORY_MAX_RUNS runs and at most HISTORY_KEEP_BYTES, so at least half the
+# threshold must be appended again before the next rewrite.
+HISTORY_TRIM_BYTES = 8 * 1024 * 1024
+HISTORY_KEEP_BYTES = HISTORY_TRIM_BYTES // 2
+ARTIFACT_SUFFIX = "_matrix.json"
+ARTIFACT_KEYS = frozenset(
+    {
+        "schema_version",
+        "project",
+        "profile",
+        "verify_every",
+        "threshold_exceedances",
+        "run_timings",
+        "results",
+    }
+)
 
 
 def load_json(path: Path):
     try:
-        return json.loads(path.read_text())
+        data = path.read_bytes()
+        return orjson.loads(data) if orjson else json.loads(data)
+    except Exception:
+        return None
+
+
+def dump_record(record) -> bytes:
+    if orjson:
+        return orjson.dumps(record) + b"\n"
+    return (json.dumps(record, separators=(",", ":")) + "\n").encode()
+
+
+def load_artifact(path: Path):
+    if ijson is None:
+        data = load_json(path)
+        if not isinstance(data, dict):
+            return None
+        return {key: value for key, value in data.items() if key in ARTIFACT_KEYS}
+    try:
+        with path.open("rb") as f:
+            return {
+                key: value
+                for key, value in ijson.kvitems(f, "", use_float=True)
+                if key in ARTIFACT_KEYS
+            }
     except Exception:
         return None
 
 
+def list_artifacts():
+    try:
+        with os.scandir(ARTIFACT_DIR) as entries:
+            return sorted(
+                entry.name
+                for entry in entries
+                if entry.name.endswith(ARTIFACT_SUFFIX) and entry.is_file()
+            )
+    except FileNotFoundError:
+        return []
+
+
+def write_history(lines):
+    tmp = HISTORY_FILE.with_suffix(".tmp")
+    with tmp.open("wb") as f:
+        f.writelines(lines)
+    os.replace(tmp, HISTORY_FILE)
+
+
+def import_legacy_history():
+    legacy = load_json(LEGACY_HISTORY_FILE)
+    runs = legacy.get("runs") if isinstance(legacy, dict) else None
+    if not runs:
+        return 0
+    runs = runs[-HISTORY_MAX_RUNS:]
+    write_history(dump_record(run) for run in runs)
+    return len(runs)
+
+
+def trim_history():
+    with HISTORY_FILE.open("rb") as f:
+        runs = deque(f, maxlen=HISTORY_MAX_RUNS)
+    size = sum(map(len, runs))
+    while len(runs) > 1 and size > HISTORY_KEEP_BYTES:
+        size -= len(runs.popleft())
+    write_history(runs)
+    return len(runs)
+
+
 def main():
     HISTORY_DIR.mkdir(parents=True, exist_ok=True)
-    history = load_json(HISTORY_FILE) or {
-        "schema_version": PERF_HISTORY_SCHEMA_VERSION,
-        "runs": [],
-    }
+    if not HISTORY_FILE.exists():
+        imported = import_legacy_history()
+        if imported:
+            print(f"Imported {imported} runs from {LEGACY_HISTORY_FILE}")
 
     run_record = {
         "schema_version": PERF_HISTORY_SCHEMA_VERSION,
@@ -33,11 +126,11 @@ def main():
         "artifacts": {},
     }
 
-    for path in sorted(ARTIFACT_DIR.glob("*_matrix.json")):
-        data = load_json(path)
+    for name in list_artifacts():
+        data = load_artifact(ARTIFACT_DIR / name)
         if not data:
             continue
-        run_record["artifacts"][path.name] = {
+        run_record["artifacts"][name] = {
             "schema_version": data.get("schema_version", PERF_HISTORY_SCHEMA_VERSION),
             "project": data.get("project"),
             "profile": data.get("profile"),
@@ -47,12 +140,14 @@ def main():
             "results": data.get("results", []),
         }
 
-    history["schema_version"] = PERF_HISTORY_SCHEMA_VERSION
-    history.setdefault("runs", []).append(run_record)
-    history["runs"] = history["runs"][-30:]
+    with HISTORY_FILE.open("ab") as f:
+        f.write(dump_record(run_record))
 
-    HISTORY_FILE.write_text(json.dumps(history, indent=2))
-    print(f"Updated {HISTORY_FILE} with {len(history['runs'])} runs")
+    if HISTORY_FILE.stat().st_size > HISTORY_TRIM_BYTES:
+        kept = trim_history()
+        print(f"Updated {HISTORY_FILE}, trimmed to the last {kept} runs")
+    else:
+        print(f"Appended run to {HISTORY_FILE}")
 
 
 if __name__ == "__main__":
@@ -2,17 +2,42 @@ import sys
 import ast
 import json
 
+class _FunctionCollector(ast.NodeVisitor):
+    """
+    Collects the names of all function and method definitions.
+
+    Definitions can only appear in statement lists, so traversal only
+    descends into those fields and never walks expressions, arguments,
+    annotations, decorators or class bases.
+    """
+
+    _STATEMENT_FIELDS = ("body", "handlers", "orelse", "finalbody", "cases")
+
+    def __init__(self):
+        self.names = []
+
+    def generic_visit(self, node):
+        for field in self._STATEMENT_FIELDS:
+            children = getattr(node, field, None)
+            if isinstance(children, list):
+                for child in children:
+                    self.visit(child)
+
+    def visit_FunctionDef(self, node):
+        self.names.append(node.name)
+        self.generic_visit(node)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
 def list_functions(source_code):
     """
     Parses Python source code and returns a list of function and method names.
     """
     try:
-        tree = ast.parse(source_code)
-        function_names = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                function_names.append(node.name)
-        return {"status": "success", "data": function_names}
+        tree = ast.parse(source_code, type_comments=False)
+        collector = _FunctionCollector()
+        collector.visit(tree)
+        return {"status": "success", "data": collector.names}
     except SyntaxError as e:
         return {
             "status": "error",
@@ -24,21 +49,28 @@ def list_functions(source_code):
             },
         }
 
+COMMANDS = {
+    "list-functions": list_functions,
+}
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print(json.dumps({"status": "error", "error": {"type": "UsageError", "message": "No command provided."}}), file=sys.stderr)
         sys.exit(1)
 
     command = sys.argv[1]
-    source = sys.stdin.read()
-
-    if command == "list-functions":
-        result = list_functions(source)
-        if result["status"] == "success":
-            print(json.dumps(result["data"]))
-        else:
-            print(json.dumps(result["error"]), file=sys.stderr)
-            sys.exit(1)
-    else:
+    handler = COMMANDS.get(command)
+    if handler is None:
         print(json.dumps({"status": "error", "error": {"type": "UsageError", "message": f"Unknown command: {command}"}}), file=sys.stderr)
         sys.exit(1)
+
+    # The Rust caller always writes UTF-8, whatever coding cookie the source
+    # declares, so decode it explicitly rather than letting ast.parse guess
+    source = sys.stdin.buffer.read().decode("utf-8")
+
+    result = handler(source)
+    if result["status"] == "success":
+        print(json.dumps(result["data"]))
+    else:
+        print(json.dumps(result["error"]), file=sys.stderr)
+        sys.exit(1)
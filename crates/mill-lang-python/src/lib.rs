@@ -587,6 +587,9 @@ def function_one():
 def function_two(param):
     return param * 2
 
+async def function_three():
+    pass
+
 class MyClass:
     def method_one(self):
         pass
@@ -598,6 +601,7 @@ class MyClass:
         if let Ok(functions) = result {
             assert!(functions.contains(&"function_one".to_string()));
             assert!(functions.contains(&"function_two".to_string()));
+            assert!(functions.contains(&"function_three".to_string()));
         }
     }
 
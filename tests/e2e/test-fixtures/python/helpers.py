@@ -2,27 +2,48 @@
 Helper functions for Python playground
 """
 
-from datetime import datetime
-from typing import Any
+import time
+from operator import attrgetter
+from typing import Any, Iterable
 from math_utils import DataItem
 
+_result_fields = attrgetter("id", "name", "value", "timestamp")
+
+# Epoch second and formatted timestamp of the last log line
+_ts_second = 0
+_ts_text = ""
+
+
+def _ts() -> str:
+    """Return the current log timestamp, formatting it at most once per second"""
+    global _ts_second, _ts_text
+    second = int(time.time())
+    if _ts_second != second:
+        _ts_second = second
+        _ts_text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+    return _ts_text
+
 
 def log_info(message: str) -> None:
     """Log an info message with timestamp"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{timestamp}] INFO: {message}")
+    print(f"[{_ts()}] INFO: {message}")
 
 
 def log_error(message: str) -> None:
     """Log an error message with timestamp"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{timestamp}] ERROR: {message}")
+    print(f"[{_ts()}] ERROR: {message}")
 
 
 def format_result(item: DataItem) -> str:
     """Format a data item for display"""
-    timestamp_str = item.timestamp.strftime("%H:%M:%S") if item.timestamp else "N/A"
-    return f"ID: {item.id}, Name: {item.name}, Value: {item.value:.2f}, Time: {timestamp_str}"
+    item_id, name, value, timestamp = _result_fields(item)
+    timestamp_str = timestamp.strftime("%H:%M:%S") if timestamp else "N/A"
+    return f"ID: {item_id}, Name: {name}, Value: {value:.2f}, Time: {timestamp_str}"
+
+
+def format_results(items: Iterable[DataItem]) -> str:
+    """Format many data items for display, one per line"""
+    return "\n".join(map(format_result, items))
 
 
 def safe_divide(a: float, b: float) -> float:
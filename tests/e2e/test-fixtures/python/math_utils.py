@@ -3,12 +3,32 @@ Math utilities for playground testing
 Contains Python code for testing LSP functionality
 """
 
-from typing import List, Optional, Dict, Any
+import sys
+from types import ModuleType
+from typing import List, Optional, Dict, Any, NamedTuple
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+from itertools import compress
 
+# find_outliers only switches to numpy from this size; below it, converting the
+# list to an array costs more than the pure-Python passes save
+NUMPY_MIN_SIZE = 256
+# dataclass(slots=True) needs Python 3.10+; older interpreters keep __dict__
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@lru_cache(maxsize=None)
+def _numpy() -> Optional[ModuleType]:
+    """Import numpy on first use, or return None if it is not installed"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+@dataclass(**DATACLASS_SLOTS)
 class DataItem:
     """Data item for processing"""
     id: int
@@ -17,6 +37,19 @@ class DataItem:
     timestamp: Optional[datetime] = None
 
 
+class ProcessedBatch(NamedTuple):
+    """Columns produced by DataProcessor.process_batch"""
+    ids: List[int]
+    values: List[float]
+    names: List[str]
+    timestamp: datetime
+
+
+def _is_valid(item_id: int, value: Optional[float], name: str) -> bool:
+    """Check if an item's fields are valid for processing"""
+    return item_id > 0 and value is not None and bool(name) and not name.isspace()
+
+
 class DataProcessor:
     """Main data processor class for testing"""
 
@@ -27,22 +60,37 @@ class DataProcessor:
 
     def process_data(self, items: List[DataItem]) -> List[DataItem]:
         """Process a list of data items"""
+        # Validation and transformation are fused into a single pass
+        now = datetime.now()
         processed = []
         for item in items:
-            if self.is_valid_item(item):
-                processed_item = self.transform_item(item)
-                processed.append(processed_item)
-                self.processed_count += 1
+            item_id, value, name = item.id, item.value, item.name
+            if _is_valid(item_id, value, name):
+                processed.append(DataItem(item_id, value * 2, name.upper(), now))
+        self.processed_count += len(processed)
 
         return processed
 
+    def process_batch(
+        self, ids: List[int], values: List[float], names: List[str]
+    ) -> ProcessedBatch:
+        """Process parallel id/value/name columns, stamping the batch once"""
+        if not len(ids) == len(values) == len(names):
+            raise ValueError(
+                f"Column lengths differ: {len(ids)} ids, {len(values)} values, "
+                f"{len(names)} names"
+            )
+        valid = list(map(_is_valid, ids, values, names))
+        out_ids = list(compress(ids, valid))
+        out_values = [value * 2 for value in compress(values, valid)]
+        out_names = [name.upper() for name in compress(names, valid)]
+        self.processed_count += len(out_ids)
+
+        return ProcessedBatch(out_ids, out_values, out_names, datetime.now())
+
     def is_valid_item(self, item: DataItem) -> bool:
         """Check if an item is valid for processing"""
-        return (
-            item.id > 0 and
-            item.value is not None and
-            len(item.name.strip()) > 0
-        )
+        return _is_valid(item.id, item.value, item.name)
 
     def transform_item(self, item: DataItem) -> DataItem:
         """Transform an individual item"""
@@ -74,16 +122,25 @@ def find_outliers(values: List[float], threshold: float = 2.0) -> List[float]:
     if len(values) < 2:
         return []
 
-    mean = calculate_average(values)
-    variance = sum((x - mean) ** 2 for x in values) / len(values)
-    std_dev = variance ** 0.5
-
-    outliers = []
+    np = _numpy() if len(values) >= NUMPY_MIN_SIZE else None
+    if np is not None:
+        array = np.asarray(values, dtype=np.float64)
+        mask = np.abs(array - array.mean()) > threshold * array.std()
+        # Select from the caller's list so element types are preserved
+        return list(compress(values, mask.tolist()))
+
+    # Welford's algorithm: mean and variance in a single pass
+    count = 0
+    mean = 0.0
+    m2 = 0.0
     for value in values:
-        if abs(value - mean) > threshold * std_dev:
-            outliers.append(value)
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        m2 += delta * (value - mean)
+    limit = threshold * (m2 / count) ** 0.5
 
-    return outliers
+    return [value for value in values if abs(value - mean) > limit]
 
 
 # Constants for testing